@@ -1,15 +1,179 @@
 import dash
-from dash import html, dcc, Input, Output, callback, dash_table
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
+from dash import html, dcc, Input, Output, State, callback, dash_table, Patch
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from datetime import datetime
-import os
-from security_analyzer import run_all_checks, get_detailed_findings
-from report_generator import create_pdf_report
+import time
+from security_analyzer import run_all_checks, get_detailed_findings, invalidate_scan
+
+# Initialize the Dash app. The findings table is created inside a callback
+# rather than in the static layout, so callbacks targeting it can't be
+# validated against the layout at startup.
+app = dash.Dash(__name__, suppress_callback_exceptions=True)
+
+# Serialize callback responses with orjson when available - the figure and
+# table payloads dominate response time and orjson is several times faster
+# than the stdlib encoder
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+
+    class _OrjsonProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.server.json = _OrjsonProvider(app.server)
+except ImportError:
+    pass  # Fall back to the stdlib json encoder
+
+# Cache scan results so repeat refreshes within the TTL don't re-run
+# every AWS API call (the dominant cost of a dashboard update)
+CACHE_TTL_SECONDS = 300
+_findings_cache = {'timestamp': 0, 'findings': None}
+
+# Shared pool so scans run off the callback thread and overlap with
+# layout construction
+_executor = ThreadPoolExecutor(max_workers=4)
+
+# Stat card styles are identical across refreshes, so build them once
+CARD_STYLE = {
+    'background-color': 'white',
+    'padding': '20px',
+    'border-radius': '10px',
+    'text-align': 'center',
+    'box-shadow': '0 2px 4px rgba(0, 0, 0, 0.1)',
+    'width': '22%',
+    'display': 'inline-block',
+    'margin-right': '4%'
+}
+CARD_STYLE_LAST = dict(CARD_STYLE, **{'margin-right': '0'})
+CARD_LABEL_STYLE = {'margin': '5px 0', 'color': '#7f8c8d'}
+
+# Optional Numba-accelerated aggregation for very large finding sets. The
+# plain Counter pass wins below this size; above it, encoding to int codes
+# and counting in a JIT kernel pays off. Falls back to Counter when Numba
+# is not installed.
+NUMBA_THRESHOLD = 10000
+
+try:
+    import numpy as np
+    from numba import njit
+
+    @njit(cache=True)
+    def _count_codes(codes, n_codes):
+        out = np.zeros(n_codes, np.int64)
+        for code in codes:
+            out[code] += 1
+        return out
+
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+
+
+def _aggregate_findings(detailed_findings):
+    """Count findings per severity and per service in one pass"""
+    if _HAVE_NUMBA and len(detailed_findings) >= NUMBA_THRESHOLD:
+        severities = sorted({f['severity'] for f in detailed_findings})
+        services = sorted({f['service'] for f in detailed_findings})
+        severity_code = {s: i for i, s in enumerate(severities)}
+        service_code = {s: i for i, s in enumerate(services)}
+
+        n = len(detailed_findings)
+        severity_arr = np.fromiter((severity_code[f['severity']] for f in detailed_findings),
+                                   dtype=np.int64, count=n)
+        service_arr = np.fromiter((service_code[f['service']] for f in detailed_findings),
+                                  dtype=np.int64, count=n)
+
+        severity_totals = _count_codes(severity_arr, len(severities))
+        service_totals = _count_codes(service_arr, len(services))
+        severity_counter = Counter({s: int(severity_totals[i]) for i, s in enumerate(severities)})
+        service_counts = Counter({s: int(service_totals[i]) for i, s in enumerate(services)})
+        return severity_counter, service_counts
+
+    severity_counter = Counter()
+    service_counts = Counter()
+    for finding in detailed_findings:
+        severity_counter[finding['severity']] += 1
+        service_counts[finding['service']] += 1
+    return severity_counter, service_counts
+
+
+SEVERITY_COLORS = {
+    'Critical': '#e74c3c',
+    'High': '#f39c12',
+    'Medium': '#27ae60',
+    'No Issues Found': '#27ae60'
+}
+
+
+def _build_pie_figure(severity_counts):
+    """Build the severity pie chart figure from scratch (first render only)"""
+    import plotly.graph_objects as go
+
+    if not severity_counts:
+        severity_counts = {'No Issues Found': 1}
+
+    pie_fig = go.Figure(go.Pie(
+        labels=list(severity_counts.keys()),
+        values=list(severity_counts.values()),
+        marker=dict(colors=[SEVERITY_COLORS[label] for label in severity_counts])
+    ))
+    pie_fig.update_layout(
+        title=dict(text="Risk Distribution by Severity", font=dict(size=16)),
+        font=dict(size=12),
+        showlegend=True
+    )
+    return pie_fig
+
+
+def _build_bar_figure(service_counts):
+    """Build the per-service bar chart figure from scratch (first render only)"""
+    import plotly.graph_objects as go
 
-# Initialize the Dash app
-app = dash.Dash(__name__)
+    if not service_counts:
+        service_counts = {'No Services': 0}
+
+    values = list(service_counts.values())
+    bar_fig = go.Figure(go.Bar(
+        x=list(service_counts.keys()),
+        y=values,
+        marker=dict(color=values, colorscale='Reds')
+    ))
+    bar_fig.update_layout(
+        title=dict(text="Issues by AWS Service", font=dict(size=16)),
+        xaxis_title="AWS Service",
+        yaxis_title="Number of Issues",
+        font=dict(size=12)
+    )
+    return bar_fig
+
+
+def make_stat_card(value, label, color, style=CARD_STYLE):
+    """Build one summary stat card; only the number and color vary per card"""
+    return html.Div([
+        html.H2(str(value), style={'color': color, 'margin': '0', 'font-size': '48px'}),
+        html.P(label, style=CARD_LABEL_STYLE)
+    ], style=style)
+
+
+def _cached_findings(force=False):
+    """Return scan findings, re-scanning AWS only when the cache has expired.
+
+    `force` bypasses the TTL so an explicit "Refresh Scan" click always
+    re-runs the checks instead of re-serving a still-fresh cache entry.
+    """
+    now = time.time()
+    if force or _findings_cache['findings'] is None or now - _findings_cache['timestamp'] > CACHE_TTL_SECONDS:
+        # The analyzer caches its scan too; drop it so this refresh re-runs
+        # the checks rather than re-serving the old result
+        invalidate_scan()
+        _findings_cache['findings'] = get_detailed_findings()
+        _findings_cache['timestamp'] = now
+    return _findings_cache['findings']
 
 # Custom CSS styling
 app.layout = html.Div([
@@ -106,9 +270,30 @@ app.layout = html.Div([
     [Input('refresh-btn', 'n_clicks')]
 )
 def update_dashboard(n_clicks):
-    # Get findings
+    # Kick off the scan immediately so AWS latency overlaps with the
+    # work below that doesn't depend on the results. A nonzero n_clicks
+    # means the user pressed "Refresh Scan", which always re-scans; only
+    # the initial page load is allowed to reuse the cache
+    scan_future = _executor.submit(_cached_findings, bool(n_clicks))
+
+    # Last updated timestamp
+    last_updated = f"Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+
+    # Collect findings (cached between refreshes to avoid redundant AWS calls)
     try:
-        detailed_findings = get_detailed_findings()
+        detailed_findings = scan_future.result(timeout=30)
+    except FuturesTimeoutError:
+        # A slow scan on a large account is not a credential problem; the
+        # scan keeps running in the pool and will populate the cache, so
+        # the next refresh picks up the real results
+        detailed_findings = [{
+            'service': 'System',
+            'issue_type': 'Scan In Progress',
+            'description': 'The security scan is still running and has not finished yet',
+            'severity': 'Medium',
+            'resource': 'Security Scanner',
+            'recommendation': 'Wait a moment and refresh the dashboard to see the results'
+        }]
     except Exception as e:
         # Handle case where AWS credentials might not be configured
         detailed_findings = [{
@@ -120,72 +305,20 @@ def update_dashboard(n_clicks):
             'recommendation': 'Configure AWS credentials and ensure proper permissions'
         }]
 
-    # Calculate statistics
+    # Calculate statistics in a single pass over the findings
+    severity_counter, service_counts = _aggregate_findings(detailed_findings)
+
     total_issues = len(detailed_findings)
-    critical_issues = len([f for f in detailed_findings if f['severity'] == 'Critical'])
-    high_issues = len([f for f in detailed_findings if f['severity'] == 'High'])
-    medium_issues = len([f for f in detailed_findings if f['severity'] == 'Medium'])
+    critical_issues = severity_counter['Critical']
+    high_issues = severity_counter['High']
+    medium_issues = severity_counter['Medium']
 
     # Stats Cards
     stats_cards = html.Div([
-        # Total Issues Card
-        html.Div([
-            html.H2(str(total_issues), style={'color': '#e74c3c', 'margin': '0', 'font-size': '48px'}),
-            html.P("Total Issues", style={'margin': '5px 0', 'color': '#7f8c8d'})
-        ], style={
-            'background-color': 'white',
-            'padding': '20px',
-            'border-radius': '10px',
-            'text-align': 'center',
-            'box-shadow': '0 2px 4px rgba(0, 0, 0, 0.1)',
-            'width': '22%',
-            'display': 'inline-block',
-            'margin-right': '4%'
-        }),
-
-        # Critical Issues Card
-        html.Div([
-            html.H2(str(critical_issues), style={'color': '#e74c3c', 'margin': '0', 'font-size': '48px'}),
-            html.P("Critical", style={'margin': '5px 0', 'color': '#7f8c8d'})
-        ], style={
-            'background-color': 'white',
-            'padding': '20px',
-            'border-radius': '10px',
-            'text-align': 'center',
-            'box-shadow': '0 2px 4px rgba(0, 0, 0, 0.1)',
-            'width': '22%',
-            'display': 'inline-block',
-            'margin-right': '4%'
-        }),
-
-        # High Issues Card
-        html.Div([
-            html.H2(str(high_issues), style={'color': '#f39c12', 'margin': '0', 'font-size': '48px'}),
-            html.P("High", style={'margin': '5px 0', 'color': '#7f8c8d'})
-        ], style={
-            'background-color': 'white',
-            'padding': '20px',
-            'border-radius': '10px',
-            'text-align': 'center',
-            'box-shadow': '0 2px 4px rgba(0, 0, 0, 0.1)',
-            'width': '22%',
-            'display': 'inline-block',
-            'margin-right': '4%'
-        }),
-
-        # Medium Issues Card
-        html.Div([
-            html.H2(str(medium_issues), style={'color': '#27ae60', 'margin': '0', 'font-size': '48px'}),
-            html.P("Medium", style={'margin': '5px 0', 'color': '#7f8c8d'})
-        ], style={
-            'background-color': 'white',
-            'padding': '20px',
-            'border-radius': '10px',
-            'text-align': 'center',
-            'box-shadow': '0 2px 4px rgba(0, 0, 0, 0.1)',
-            'width': '22%',
-            'display': 'inline-block'
-        })
+        make_stat_card(total_issues, "Total Issues", '#e74c3c'),
+        make_stat_card(critical_issues, "Critical", '#e74c3c'),
+        make_stat_card(high_issues, "High", '#f39c12'),
+        make_stat_card(medium_issues, "Medium", '#27ae60', style=CARD_STYLE_LAST)
     ])
 
     # Risk Distribution Pie Chart
@@ -193,65 +326,30 @@ def update_dashboard(n_clicks):
     # Filter out zero values for cleaner chart
     severity_counts = {k: v for k, v in severity_counts.items() if v > 0}
 
-    if severity_counts:
-        pie_fig = px.pie(
-            values=list(severity_counts.values()),
-            names=list(severity_counts.keys()),
-            title="Risk Distribution by Severity",
-            color_discrete_map={
-                'Critical': '#e74c3c',
-                'High': '#f39c12',
-                'Medium': '#27ae60'
-            }
-        )
+    if n_clicks:
+        # Subsequent refreshes only change the numeric arrays, so patch the
+        # existing figures in place instead of shipping full figure specs
+        pie_labels = list(severity_counts.keys()) or ['No Issues Found']
+        pie_values = list(severity_counts.values()) or [1]
+
+        pie_fig = Patch()
+        pie_fig['data'][0]['labels'] = pie_labels
+        pie_fig['data'][0]['values'] = pie_values
+        pie_fig['data'][0]['marker']['colors'] = [SEVERITY_COLORS[label] for label in pie_labels]
+
+        bar_fig = Patch()
+        bar_fig['data'][0]['x'] = list(service_counts.keys()) or ['No Services']
+        bar_fig['data'][0]['y'] = list(service_counts.values()) or [0]
+        bar_fig['data'][0]['marker']['color'] = list(service_counts.values()) or [0]
     else:
-        pie_fig = px.pie(
-            values=[1],
-            names=['No Issues Found'],
-            title="Risk Distribution by Severity",
-            color_discrete_map={'No Issues Found': '#27ae60'}
-        )
-
-    pie_fig.update_layout(
-        title_font_size=16,
-        font=dict(size=12),
-        showlegend=True
-    )
-
-    # Service Issues Bar Chart
-    service_counts = {}
-    for finding in detailed_findings:
-        service = finding['service']
-        service_counts[service] = service_counts.get(service, 0) + 1
-
-    if service_counts:
-        bar_fig = px.bar(
-            x=list(service_counts.keys()),
-            y=list(service_counts.values()),
-            title="Issues by AWS Service",
-            color=list(service_counts.values()),
-            color_continuous_scale='Reds'
-        )
-    else:
-        bar_fig = px.bar(
-            x=['No Services'],
-            y=[0],
-            title="Issues by AWS Service"
-        )
-
-    bar_fig.update_layout(
-        title_font_size=16,
-        xaxis_title="AWS Service",
-        yaxis_title="Number of Issues",
-        font=dict(size=12)
-    )
+        pie_fig = _build_pie_figure(severity_counts)
+        bar_fig = _build_bar_figure(service_counts)
 
     # Findings Table
     if detailed_findings:
-        df = pd.DataFrame(detailed_findings)
-
         table = dash_table.DataTable(
-            data=df.to_dict('records'),
+            id='findings-datatable',
+            data=detailed_findings,
             columns=[
                 {"name": "Service", "id": "service"},
                 {"name": "Issue Type", "id": "issue_type"},
@@ -289,16 +387,14 @@ def update_dashboard(n_clicks):
                 'color': 'white',
                 'fontWeight': 'bold'
             },
-            page_size=10,
+            # Virtualized rendering keeps the client-side cost constant no
+            # matter how many findings the scan returns
+            virtualization=True,
+            fixed_rows={'headers': True},
+            style_table={'height': '400px', 'overflowY': 'auto'},
+            page_action='none',
             sort_action="native",
-            filter_action="native",
-            tooltip_data=[
-                {
-                    column: {'value': str(value), 'type': 'markdown'}
-                    for column, value in row.items()
-                } for row in df.to_dict('records')
-            ],
-            tooltip_duration=None
+            filter_action="native"
         )
     else:
         table = html.Div([
@@ -306,12 +402,33 @@ def update_dashboard(n_clicks):
                    style={'text-align': 'center', 'color': '#7f8c8d', 'font-style': 'italic'})
         ])
 
-    # Last updated timestamp
-    last_updated = f"Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-
     return stats_cards, pie_fig, bar_fig, table, last_updated
 
 
+@callback(
+    Output('findings-datatable', 'tooltip_data'),
+    Input('findings-datatable', 'derived_viewport_data'),
+    State('findings-datatable', 'derived_viewport_indices'),
+    State('findings-datatable', 'data'),
+    prevent_initial_call=True
+)
+def update_table_tooltips(viewport_rows, viewport_indices, data):
+    """Supply full-text tooltips for the rows currently on screen.
+
+    Cells are ellipsis-truncated, so the tooltip is how long descriptions
+    get read. Building tooltip entries for every row up front scales with
+    the full finding count; this fires as the virtualized table scrolls
+    and fills in only the visible slice.
+    """
+    if not viewport_rows or not data:
+        return []
+
+    tooltips = [{} for _ in data]
+    for index, row in zip(viewport_indices, viewport_rows):
+        tooltips[index] = {column: {'value': str(value)} for column, value in row.items()}
+    return tooltips
+
+
 @callback(
     Output("download-pdf", "data"),
     Input("download-btn", "n_clicks"),
@@ -319,19 +436,17 @@ def update_dashboard(n_clicks):
 )
 def download_report(n_clicks):
     if n_clicks and n_clicks > 0:
-        # Ensure reports directory exists
-        os.makedirs("reports", exist_ok=True)
+        # Deferred so app startup doesn't pay for reportlab unless a
+        # report is actually requested
+        from report_generator import create_pdf_report
 
-        # Generate PDF report
-        pdf_filename = f"reports/aws_security_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        create_pdf_report(pdf_filename)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
-        # Read the PDF file and return for download
+        # Generate the PDF in memory from the cached scan - no intermediate
+        # file on disk and no second round of AWS calls
         try:
-            with open(pdf_filename, "rb") as f:
-                pdf_data = f.read()
-
-            return dcc.send_bytes(pdf_data, f"aws_security_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
+            buffer = create_pdf_report(findings=_cached_findings())
+            return dcc.send_bytes(buffer.getvalue(), f"aws_security_report_{timestamp}.pdf")
         except Exception as e:
             print(f"Error downloading PDF: {e}")
             return None
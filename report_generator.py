@@ -8,57 +8,160 @@ from reportlab.graphics.shapes import Drawing
 from reportlab.graphics.charts.piecharts import Pie
 from reportlab.graphics.charts.barcharts import VerticalBarChart
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+import io
 import os
+from collections import Counter, defaultdict
+from xml.sax.saxutils import escape
 from datetime import datetime
-from security_analyzer import get_detailed_findings, get_summary_stats
+from security_analyzer import get_detailed_findings, summarize_findings
+
+# Directories already created this process; avoids a stat+mkdir syscall
+# on every report written to disk
+_created_dirs = set()
+
+
+def _ensure_dir(path):
+    if path and path not in _created_dirs:
+        os.makedirs(path, exist_ok=True)
+        _created_dirs.add(path)
+
+
+# Shared stylesheet; building one per report just re-parses the same styles
+_STYLES = getSampleStyleSheet()
+
+# Report-wide styles are identical for every report, so build them once.
+# Flowables themselves are stateful during doc.build, so only the styles
+# and source text are cached, not Paragraph objects.
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=24,
+    textColor=colors.HexColor('#2c3e50'),
+    spaceAfter=30,
+    alignment=TA_CENTER
+)
+
+SUBTITLE_STYLE = ParagraphStyle(
+    'CustomSubtitle',
+    parent=_STYLES['Heading2'],
+    fontSize=16,
+    textColor=colors.HexColor('#7f8c8d'),
+    spaceAfter=20,
+    alignment=TA_CENTER
+)
+
+HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_STYLES['Heading2'],
+    fontSize=16,
+    textColor=colors.HexColor('#34495e'),
+    spaceAfter=12,
+    spaceBefore=20
+)
+
+FOOTER_STYLE = ParagraphStyle(
+    'Footer',
+    parent=_STYLES['Normal'],
+    alignment=TA_CENTER,
+    textColor=colors.gray
+)
+
+RECOMMENDATIONS_TEXT = """
+    <b>Immediate Actions (Critical Issues):</b><br/>
+    1. Review and restrict any publicly accessible S3 buckets<br/>
+    2. Disable public access for RDS instances<br/>
+    3. Stop using root account for daily operations<br/>
 
+    <b>Short-term Actions (High Priority):</b><br/>
+    1. Enable MFA for all IAM users<br/>
+    2. Review and tighten security group rules<br/>
+    3. Implement least privilege access policies<br/>
 
-def create_pdf_report(filename="reports/security_report.pdf"):
-    # Ensure reports directory exists
-    os.makedirs("reports", exist_ok=True)
+    <b>Long-term Actions (Medium Priority):</b><br/>
+    1. Regular access key rotation and cleanup<br/>
+    2. Implement automated security monitoring<br/>
+    3. Regular security assessments and audits<br/>
 
-    # Get data
-    detailed_findings = get_detailed_findings()
-    stats = get_summary_stats()
+    <b>Best Practices:</b><br/>
+    • Use IAM roles instead of access keys where possible<br/>
+    • Enable CloudTrail for audit logging<br/>
+    • Implement AWS Config for compliance monitoring<br/>
+    • Use AWS Security Hub for centralized security findings<br/>
+    """
+
+
+def _severity_header_style(name, color):
+    return ParagraphStyle(name, parent=_STYLES['Heading3'],
+                          textColor=colors.HexColor(color), fontSize=14)
+
+
+# Severity sections rendered in the detailed findings chapter, in order.
+# Header styles are built once here instead of per report.
+SEVERITY_SECTIONS = [
+    ('Critical', '🔴 Critical Issues', _severity_header_style('CriticalHeader', '#e74c3c')),
+    ('High', '🟡 High Priority Issues', _severity_header_style('HighHeader', '#f39c12')),
+    ('Medium', '🟢 Medium Priority Issues', _severity_header_style('MediumHeader', '#27ae60'))
+]
+
+
+def _emit_findings_section(story, findings, title, header_style, styles):
+    """Append one severity section (header plus numbered findings) to the story"""
+    if not findings:
+        return
+
+    story.append(Paragraph(title, header_style))
+
+    # One combined Paragraph per section halves the number of flowables
+    # platypus has to lay out compared to a Paragraph+Spacer per finding
+    parts = []
+    for i, finding in enumerate(findings, 1):
+        # Escape finding fields before interpolating into Paragraph markup -
+        # resource ARNs and descriptions can legally contain & or <
+        issue_type = escape(finding['issue_type'])
+        service = escape(finding['service'])
+        resource = escape(finding['resource'])
+        description = escape(finding['description'])
+        recommendation = escape(finding['recommendation'])
+        parts.append(
+            f"<b>{i}. {issue_type} - {service}</b><br/>"
+            f"<b>Resource:</b> {resource}<br/>"
+            f"<b>Description:</b> {description}<br/>"
+            f"<b>Recommendation:</b> {recommendation}<br/><br/>"
+        )
+
+    story.append(Paragraph("".join(parts), styles['Normal']))
+    story.append(Spacer(1, 0.2 * inch))
+
+
+def create_pdf_report(output=None, findings=None, stats=None):
+    """Build the PDF report into `output` (a path or file-like object).
+
+    Defaults to an in-memory BytesIO buffer so callers such as the dashboard
+    download can serve the PDF without touching the filesystem. Callers that
+    already hold scan results can pass them via `findings`/`stats` to avoid
+    re-running every AWS check. The buffer (or path) is returned.
+    """
+    if output is None:
+        output = io.BytesIO()
+    elif isinstance(output, str):
+        # Ensure reports directory exists when writing to a path
+        _ensure_dir(os.path.dirname(output))
+
+    # Get data, reusing what the caller already fetched where possible
+    detailed_findings = findings if findings is not None else get_detailed_findings()
+    if stats is None:
+        stats = summarize_findings(detailed_findings)
 
     # Create PDF document
-    doc = SimpleDocTemplate(filename, pagesize=A4)
-    styles = getSampleStyleSheet()
+    doc = SimpleDocTemplate(output, pagesize=A4)
+    styles = _STYLES
     story = []
 
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#2c3e50'),
-        spaceAfter=30,
-        alignment=TA_CENTER
-    )
-
-    subtitle_style = ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=colors.HexColor('#7f8c8d'),
-        spaceAfter=20,
-        alignment=TA_CENTER
-    )
-
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=colors.HexColor('#34495e'),
-        spaceAfter=12,
-        spaceBefore=20
-    )
-
     # Title Page
     story.append(Spacer(1, 2 * inch))
-    story.append(Paragraph("AWS Cloud Risk Analyzer", title_style))
-    story.append(Paragraph("Security Assessment Report", subtitle_style))
-    story.append(Paragraph("by Bhavika Gupta", subtitle_style))
+    story.append(Paragraph("AWS Cloud Risk Analyzer", TITLE_STYLE))
+    story.append(Paragraph("Security Assessment Report", SUBTITLE_STYLE))
+    story.append(Paragraph("by Bhavika Gupta", SUBTITLE_STYLE))
     story.append(Spacer(1, 1 * inch))
 
     # Report metadata
@@ -84,7 +187,7 @@ def create_pdf_report(filename="reports/security_report.pdf"):
     story.append(PageBreak())
 
     # Executive Summary
-    story.append(Paragraph("Executive Summary", heading_style))
+    story.append(Paragraph("Executive Summary", HEADING_STYLE))
 
     summary_text = f"""
     This security assessment identified <b>{stats['total_issues']} security issues</b> across your AWS environment. 
@@ -104,7 +207,7 @@ def create_pdf_report(filename="reports/security_report.pdf"):
 
     # Risk Distribution Chart
     if stats['total_issues'] > 0:
-        story.append(Paragraph("Risk Distribution", heading_style))
+        story.append(Paragraph("Risk Distribution", HEADING_STYLE))
 
         # Create pie chart
         drawing = Drawing(400, 200)
@@ -125,16 +228,13 @@ def create_pdf_report(filename="reports/security_report.pdf"):
         story.append(Spacer(1, 0.3 * inch))
 
     # Service Breakdown
-    service_counts = {}
-    for finding in detailed_findings:
-        service = finding['service']
-        service_counts[service] = service_counts.get(service, 0) + 1
+    service_counts = Counter(finding['service'] for finding in detailed_findings)
 
     if service_counts:
-        story.append(Paragraph("Issues by Service", heading_style))
+        story.append(Paragraph("Issues by Service", HEADING_STYLE))
 
         service_data = [['AWS Service', 'Number of Issues', 'Percentage']]
-        for service, count in sorted(service_counts.items(), key=lambda x: x[1], reverse=True):
+        for service, count in service_counts.most_common():
             percentage = f"{(count / stats['total_issues'] * 100):.1f}%"
             service_data.append([service, str(count), percentage])
 
@@ -157,64 +257,17 @@ def create_pdf_report(filename="reports/security_report.pdf"):
 
     # Detailed Findings
     story.append(PageBreak())
-    story.append(Paragraph("Detailed Security Findings", heading_style))
+    story.append(Paragraph("Detailed Security Findings", HEADING_STYLE))
 
     if detailed_findings:
-        # Group findings by severity
-        critical_findings = [f for f in detailed_findings if f['severity'] == 'Critical']
-        high_findings = [f for f in detailed_findings if f['severity'] == 'High']
-        medium_findings = [f for f in detailed_findings if f['severity'] == 'Medium']
-
-        # Critical Issues
-        if critical_findings:
-            story.append(Paragraph("🔴 Critical Issues", ParagraphStyle(
-                'CriticalHeader', parent=styles['Heading3'],
-                textColor=colors.HexColor('#e74c3c'), fontSize=14
-            )))
-
-            for i, finding in enumerate(critical_findings, 1):
-                issue_text = f"""
-                <b>{i}. {finding['issue_type']} - {finding['service']}</b><br/>
-                <b>Resource:</b> {finding['resource']}<br/>
-                <b>Description:</b> {finding['description']}<br/>
-                <b>Recommendation:</b> {finding['recommendation']}<br/>
-                """
-                story.append(Paragraph(issue_text, styles['Normal']))
-                story.append(Spacer(1, 0.2 * inch))
-
-        # High Issues
-        if high_findings:
-            story.append(Paragraph("🟡 High Priority Issues", ParagraphStyle(
-                'HighHeader', parent=styles['Heading3'],
-                textColor=colors.HexColor('#f39c12'), fontSize=14
-            )))
-
-            for i, finding in enumerate(high_findings, 1):
-                issue_text = f"""
-                <b>{i}. {finding['issue_type']} - {finding['service']}</b><br/>
-                <b>Resource:</b> {finding['resource']}<br/>
-                <b>Description:</b> {finding['description']}<br/>
-                <b>Recommendation:</b> {finding['recommendation']}<br/>
-                """
-                story.append(Paragraph(issue_text, styles['Normal']))
-                story.append(Spacer(1, 0.2 * inch))
-
-        # Medium Issues
-        if medium_findings:
-            story.append(Paragraph("🟢 Medium Priority Issues", ParagraphStyle(
-                'MediumHeader', parent=styles['Heading3'],
-                textColor=colors.HexColor('#27ae60'), fontSize=14
-            )))
-
-            for i, finding in enumerate(medium_findings, 1):
-                issue_text = f"""
-                <b>{i}. {finding['issue_type']} - {finding['service']}</b><br/>
-                <b>Resource:</b> {finding['resource']}<br/>
-                <b>Description:</b> {finding['description']}<br/>
-                <b>Recommendation:</b> {finding['recommendation']}<br/>
-                """
-                story.append(Paragraph(issue_text, styles['Normal']))
-                story.append(Spacer(1, 0.2 * inch))
+        # Group findings by severity in one pass
+        findings_by_severity = defaultdict(list)
+        for finding in detailed_findings:
+            findings_by_severity[finding['severity']].append(finding)
+
+        for severity, section_title, section_style in SEVERITY_SECTIONS:
+            _emit_findings_section(story, findings_by_severity.get(severity, []),
+                                   section_title, section_style, styles)
 
     else:
         story.append(Paragraph("No security issues found! Your AWS environment appears to be well-configured.",
@@ -222,43 +275,20 @@ def create_pdf_report(filename="reports/security_report.pdf"):
 
     # Recommendations Summary
     story.append(PageBreak())
-    story.append(Paragraph("Next Steps & Recommendations", heading_style))
-
-    recommendations_text = """
-    <b>Immediate Actions (Critical Issues):</b><br/>
-    1. Review and restrict any publicly accessible S3 buckets<br/>
-    2. Disable public access for RDS instances<br/>
-    3. Stop using root account for daily operations<br/>
-
-    <b>Short-term Actions (High Priority):</b><br/>
-    1. Enable MFA for all IAM users<br/>
-    2. Review and tighten security group rules<br/>
-    3. Implement least privilege access policies<br/>
-
-    <b>Long-term Actions (Medium Priority):</b><br/>
-    1. Regular access key rotation and cleanup<br/>
-    2. Implement automated security monitoring<br/>
-    3. Regular security assessments and audits<br/>
-
-    <b>Best Practices:</b><br/>
-    • Use IAM roles instead of access keys where possible<br/>
-    • Enable CloudTrail for audit logging<br/>
-    • Implement AWS Config for compliance monitoring<br/>
-    • Use AWS Security Hub for centralized security findings<br/>
-    """
+    story.append(Paragraph("Next Steps & Recommendations", HEADING_STYLE))
 
-    story.append(Paragraph(recommendations_text, styles['Normal']))
+    story.append(Paragraph(RECOMMENDATIONS_TEXT, styles['Normal']))
 
     # Footer
     story.append(Spacer(1, 1 * inch))
-    story.append(Paragraph("Report generated by AWS Cloud Risk Analyzer",
-                           ParagraphStyle('Footer', parent=styles['Normal'],
-                                          alignment=TA_CENTER, textColor=colors.gray)))
+    story.append(Paragraph("Report generated by AWS Cloud Risk Analyzer", FOOTER_STYLE))
 
     # Build PDF
     doc.build(story)
-    print(f"PDF report generated: {filename}")
+    if isinstance(output, str):
+        print(f"PDF report generated: {output}")
+    return output
 
 
 if __name__ == "__main__":
-    create_pdf_report()
+    create_pdf_report("reports/security_report.pdf")
@@ -1,222 +1,431 @@
 import boto3
 import botocore
+import csv
+import io
+import json
+import threading
+import time
+from botocore.config import Config
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime
-
-
-def check_s3_public_buckets():
-    s3 = boto3.client('s3')
+from functools import lru_cache
+
+
+def paginate(client, method, key, **kwargs):
+    """Yield every item under `key` across all pages of a paginated API.
+
+    Direct calls like iam.list_users() silently truncate at the first page,
+    which on large accounts produces incomplete findings.
+    """
+    for page in client.get_paginator(method).paginate(**kwargs):
+        yield from page[key]
+
+
+_session = boto3.session.Session()
+
+# The checks run concurrently against shared clients; the default pool of
+# 10 connections would serialize them under load. Adaptive retries absorb
+# the throttling the extra concurrency can provoke.
+_CLIENT_CONFIG = Config(
+    max_pool_connections=32,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    tcp_keepalive=True
+)
+
+
+@lru_cache(maxsize=None)
+def _client(service_name):
+    """One client per service per process.
+
+    Client construction parses the full JSON service model and resolves
+    credentials, so rebuilding one for every check is pure overhead.
+    """
+    return _session.client(service_name, config=_CLIENT_CONFIG)
+
+
+_credential_report_lock = threading.Lock()
+
+# How many one-second polls to give IAM before declaring the credential
+# report stuck; generation normally completes within a few seconds
+_CREDENTIAL_REPORT_ATTEMPTS = 30
+
+
+@lru_cache(maxsize=1)
+def _fetch_credential_report():
+    iam = _client('iam')
+    # Generation is asynchronous; the call returns the report state and
+    # flips to COMPLETE within a few seconds on most accounts. The poll
+    # is bounded because this runs while _run_scan holds the scan lock -
+    # spinning forever here would wedge every later scan behind it.
+    for _ in range(_CREDENTIAL_REPORT_ATTEMPTS):
+        response = iam.generate_credential_report()
+        if response['State'] == 'COMPLETE':
+            break
+        time.sleep(1)
+    else:
+        # WaiterError is a BotoCoreError, so _collect turns this into the
+        # usual per-check error finding instead of hanging the process
+        raise botocore.exceptions.WaiterError(
+            name='credential-report-complete',
+            reason=f'report not ready after {_CREDENTIAL_REPORT_ATTEMPTS} attempts',
+            last_response=response)
+    content = iam.get_credential_report()['Content'].decode('utf-8')
+    return tuple(csv.DictReader(io.StringIO(content)))
+
+
+def _get_credential_report():
+    """Return the parsed IAM credential report, fetched at most once per scan.
+
+    One report covers MFA status and access-key usage for every user, so
+    the user-level checks share it instead of making per-user IAM calls.
+    The lock keeps concurrent checks from racing past the cache and
+    generating the report twice.
+    """
+    with _credential_report_lock:
+        return _fetch_credential_report()
+
+
+# Ports whose exposure to the world warrants Critical severity
+# (SSH, RDP, MSSQL, MySQL, PostgreSQL)
+_CRITICAL_PORTS = frozenset({22, 3389, 1433, 3306, 5432})
+
+# Grantee URIs that make an ACL grant world- or any-authenticated-readable
+_PUBLIC_GRANTEE_URIS = (
+    'http://acs.amazonaws.com/groups/global/AllUsers',
+    'http://acs.amazonaws.com/groups/global/AuthenticatedUsers'
+)
+
+
+@dataclass(frozen=True, slots=True)
+class FindingTemplate:
+    """Static fields of one issue type; instantiate() fills in the rest.
+
+    Building findings through a template avoids re-interpreting a six-key
+    dict literal on every match and keeps the static copy in one place.
+    """
+    service: str
+    issue_type: str
+    severity: str
+    recommendation: str
+
+    def instantiate(self, description, resource, severity=None):
+        return {
+            'service': self.service,
+            'issue_type': self.issue_type,
+            'description': description,
+            'severity': severity or self.severity,
+            'resource': resource,
+            'recommendation': self.recommendation
+        }
+
+
+# One template per issue type the checks can raise
+_S3_PUBLIC = FindingTemplate(
+    'S3', 'Public Bucket', 'Critical',
+    'Review bucket permissions and restrict public access')
+_S3_ACCESS_DENIED = FindingTemplate(
+    'S3', 'Access Denied', 'Medium',
+    'Ensure appropriate permissions for security scanning')
+_SG_PERMISSIVE = FindingTemplate(
+    'EC2', 'Permissive Security Group', 'High',
+    'Restrict source IP ranges to specific networks or addresses')
+_ROOT_USAGE = FindingTemplate(
+    'IAM', 'Root Account Usage', 'Critical',
+    'Use IAM users with appropriate permissions instead of root account')
+_NO_MFA = FindingTemplate(
+    'IAM', 'No MFA', 'High',
+    'Enable MFA for all IAM users with console access')
+_UNUSED_KEY = FindingTemplate(
+    'IAM', 'Unused Access Key', 'Medium',
+    'Remove unused access keys to reduce attack surface')
+_RDS_PUBLIC = FindingTemplate(
+    'RDS', 'Public Database', 'Critical',
+    'Disable public accessibility and use VPC security groups')
+_CHECK_ERROR = FindingTemplate(
+    'System', 'Check Error', 'Medium',
+    'Check AWS credentials and permissions')
+
+
+def _principal_is_public(principal):
+    if principal == '*':
+        return True
+    if isinstance(principal, dict):
+        aws = principal.get('AWS')
+        if aws == '*':
+            return True
+        if isinstance(aws, list) and '*' in aws:
+            return True
+    return False
+
+
+def _policy_allows_public_access(policy_doc):
+    """True if any Allow statement grants access to an anonymous principal.
+
+    Substring-matching the raw policy JSON missed forms like
+    {"Principal": {"AWS": "*"}} and whitespace variants; walking the parsed
+    Statement list catches them all.
+    """
+    statements = policy_doc.get('Statement', [])
+    if isinstance(statements, dict):
+        statements = [statements]
+    return any(
+        stmt.get('Effect') == 'Allow' and _principal_is_public(stmt.get('Principal'))
+        for stmt in statements
+    )
+
+
+def _collect(generator, error_message):
+    """Materialize a check generator into the legacy (findings, details) pair.
+
+    The human-readable strings are derived from the detail dicts here, at
+    the one place that needs them, instead of being assembled separately in
+    every detection branch. Findings yielded before a failure are kept,
+    matching the original incremental list-building behavior of the checks.
+
+    Only AWS-side failures (ClientError for API errors, BotoCoreError for
+    missing credentials, endpoint problems and the like) are converted to
+    error findings; programming errors in the checks propagate so they
+    surface as tracebacks instead of masquerading as scan results.
+    """
     findings = []
     detailed_findings = []
+    try:
+        for detail in generator:
+            findings.append(f"{detail['issue_type']}: {detail['resource']}")
+            detailed_findings.append(detail)
+    except (botocore.exceptions.ClientError, botocore.exceptions.BotoCoreError) as e:
+        findings.append(f"{error_message}: {str(e)}")
+    return findings, detailed_findings
+
 
+# The four S3 Block Public Access flags; with all of them set, a bucket
+# cannot be public no matter what its ACL or policy says
+_BPA_FLAGS = ('BlockPublicAcls', 'IgnorePublicAcls', 'BlockPublicPolicy', 'RestrictPublicBuckets')
+
+
+def _all_bpa_flags_set(config):
+    return all(config.get(flag) for flag in _BPA_FLAGS)
+
+
+def _account_blocks_public_access():
+    """True if account-level S3 Block Public Access has all four flags on"""
     try:
-        buckets = s3.list_buckets().get('Buckets', [])
-        for bucket in buckets:
-            name = bucket['Name']
+        account_id = _client('sts').get_caller_identity()['Account']
+        config = _client('s3control').get_public_access_block(
+            AccountId=account_id)['PublicAccessBlockConfiguration']
+        return _all_bpa_flags_set(config)
+    except botocore.exceptions.ClientError:
+        return False  # No account-level configuration, or no permission to read it
+
+
+def _bucket_blocks_public_access(s3, name):
+    try:
+        config = s3.get_public_access_block(Bucket=name)['PublicAccessBlockConfiguration']
+        return _all_bpa_flags_set(config)
+    except botocore.exceptions.ClientError:
+        return False  # No bucket-level configuration
+
+
+@lru_cache(maxsize=None)
+def _regional_s3(region):
+    """S3 client pinned to one region.
+
+    Bucket-level calls routed through an out-of-region client cost an
+    extra redirect round-trip each; a client in the bucket's home region
+    goes straight to the right endpoint.
+    """
+    return _session.client('s3', region_name=region, config=_CLIENT_CONFIG)
+
+
+def _bucket_region(s3, name):
+    # us-east-1 reports its location as a null constraint, and buckets
+    # created before region names existed report the literal 'EU'
+    location = s3.get_bucket_location(Bucket=name).get('LocationConstraint')
+    if location == 'EU':
+        return 'eu-west-1'
+    return location or 'us-east-1'
+
+
+def _iter_s3_public_buckets():
+    s3 = _client('s3')
+
+    # With account-wide Block Public Access fully on (the default for new
+    # accounts), no bucket can be public - skip the per-bucket walk
+    if _account_blocks_public_access():
+        return
+
+    def _scan_bucket(name):
+        results = []
+        try:
+            regional = _regional_s3(_bucket_region(s3, name))
+
+            if _bucket_blocks_public_access(regional, name):
+                return results
+
+            # Check bucket ACL
+            acl = regional.get_bucket_acl(Bucket=name)
+            is_public = any(
+                grant.get('Grantee', {}).get('URI') in _PUBLIC_GRANTEE_URIS
+                for grant in acl['Grants']
+            )
+
+            # Check bucket policy
             try:
-                # Check bucket ACL
-                acl = s3.get_bucket_acl(Bucket=name)
-                is_public = False
-
-                for grant in acl['Grants']:
-                    if 'AllUsers' in str(grant['Grantee']) or 'AuthenticatedUsers' in str(grant['Grantee']):
-                        is_public = True
-                        break
-
-                # Check bucket policy
-                try:
-                    policy = s3.get_bucket_policy(Bucket=name)
-                    if '"Principal": "*"' in policy['Policy']:
-                        is_public = True
-                except botocore.exceptions.ClientError:
-                    pass  # No bucket policy exists
-
-                if is_public:
-                    finding = f"Public S3 Bucket: {name}"
-                    findings.append(finding)
-                    detailed_findings.append({
-                        'service': 'S3',
-                        'issue_type': 'Public Bucket',
-                        'description': f'Bucket "{name}" is publicly accessible',
-                        'severity': 'Critical',
-                        'resource': name,
-                        'recommendation': 'Review bucket permissions and restrict public access'
-                    })
-
-            except botocore.exceptions.ClientError as e:
-                if e.response['Error']['Code'] == 'AccessDenied':
-                    finding = f"Access Denied: Cannot check ACL for bucket {name}"
-                    findings.append(finding)
-                    detailed_findings.append({
-                        'service': 'S3',
-                        'issue_type': 'Access Denied',
-                        'description': f'Cannot access bucket "{name}" for security analysis',
-                        'severity': 'Medium',
-                        'resource': name,
-                        'recommendation': 'Ensure appropriate permissions for security scanning'
-                    })
+                policy = regional.get_bucket_policy(Bucket=name)
+                if _policy_allows_public_access(json.loads(policy['Policy'])):
+                    is_public = True
+            except botocore.exceptions.ClientError:
+                pass  # No bucket policy exists
+
+            if is_public:
+                results.append(_S3_PUBLIC.instantiate(
+                    f'Bucket "{name}" is publicly accessible', name))
+
+        except botocore.exceptions.ClientError as e:
+            if e.response['Error']['Code'] == 'AccessDenied':
+                results.append(_S3_ACCESS_DENIED.instantiate(
+                    f'Cannot access bucket "{name}" for security analysis', name))
+            else:
+                raise
+        except botocore.exceptions.BotoCoreError as e:
+            # Endpoint/connection failures for one bucket shouldn't abort
+            # the scan of every other bucket
+            results.append(_CHECK_ERROR.instantiate(
+                f'Error scanning bucket "{name}": {str(e)}', name))
+        return results
+
+    names = [bucket['Name'] for bucket in s3.list_buckets().get('Buckets', [])]
+
+    # Three or four round-trips per bucket; overlap them across buckets
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        for results in executor.map(_scan_bucket, names):
+            yield from results
+
+
+def check_s3_public_buckets():
+    return _collect(_iter_s3_public_buckets(), "Error checking S3 buckets")
+
+
+def _public_source_cidrs(perm):
+    """Yield the world-open source ranges of one rule, IPv4 and IPv6 alike"""
+    for ip_range in perm.get('IpRanges', []):
+        if ip_range.get('CidrIp') == '0.0.0.0/0':
+            yield '0.0.0.0/0'
+    for ip_range in perm.get('Ipv6Ranges', []):
+        if ip_range.get('CidrIpv6') == '::/0':
+            yield '::/0'
+
+
+def _iter_security_groups():
+    ec2 = _client('ec2')
+
+    for sg in paginate(ec2, 'describe_security_groups', 'SecurityGroups'):
+        for perm in sg.get('IpPermissions', []):
+            for cidr in _public_source_cidrs(perm):
+                protocol = perm.get('IpProtocol')
+
+                if protocol == '-1':
+                    # All protocols implies every port; unconditionally Critical
+                    protocol = "all protocols"
+                    port_info = "all ports"
+                    severity = "Critical"
                 else:
-                    raise
-    except Exception as e:
-        findings.append(f"Error checking S3 buckets: {str(e)}")
+                    if perm.get('FromPort') == perm.get('ToPort'):
+                        port_info = f"port {perm.get('FromPort')}"
+                    else:
+                        port_info = f"ports {perm.get('FromPort')}-{perm.get('ToPort')}"
 
-    return findings, detailed_findings
+                    # Critical ports
+                    severity = "Critical" if perm.get('FromPort') in _CRITICAL_PORTS else "High"
+
+                yield _SG_PERMISSIVE.instantiate(
+                    f'Security group allows {protocol} traffic on {port_info} from anywhere ({cidr})',
+                    sg['GroupId'], severity=severity)
 
 
 def check_security_groups():
-    ec2 = boto3.client('ec2')
-    findings = []
-    detailed_findings = []
+    return _collect(_iter_security_groups(), "Error checking security groups")
 
-    try:
-        groups = ec2.describe_security_groups()['SecurityGroups']
-        for sg in groups:
-            for perm in sg.get('IpPermissions', []):
-                for ip_range in perm.get('IpRanges', []):
-                    if ip_range.get('CidrIp') == '0.0.0.0/0':
-                        port_info = ""
-                        severity = "High"
-
-                        if perm.get('FromPort') == perm.get('ToPort'):
-                            port_info = f"port {perm.get('FromPort')}"
-                        else:
-                            port_info = f"ports {perm.get('FromPort')}-{perm.get('ToPort')}"
-
-                        # Critical ports
-                        if perm.get('FromPort') in [22, 3389, 1433, 3306, 5432]:
-                            severity = "Critical"
-
-                        finding = f"Overly permissive SG: {sg['GroupId']} allows {perm.get('IpProtocol')} on {port_info} from 0.0.0.0/0"
-                        findings.append(finding)
-                        detailed_findings.append({
-                            'service': 'EC2',
-                            'issue_type': 'Permissive Security Group',
-                            'description': f'Security group allows {perm.get("IpProtocol")} traffic on {port_info} from anywhere',
-                            'severity': severity,
-                            'resource': sg['GroupId'],
-                            'recommendation': 'Restrict source IP ranges to specific networks or addresses'
-                        })
-    except Exception as e:
-        findings.append(f"Error checking security groups: {str(e)}")
 
-    return findings, detailed_findings
+def _iter_root_usage():
+    cloudtrail = _client('cloudtrail')
+
+    # A single 10-event page is enough to flag root usage; the bare
+    # lookup_events call with MaxItems pulled full-size pages behind
+    # the scenes
+    paginator = cloudtrail.get_paginator('lookup_events')
+    page = next(iter(paginator.paginate(
+        LookupAttributes=[{'AttributeKey': 'Username', 'AttributeValue': 'root'}],
+        PaginationConfig={'MaxItems': 10, 'PageSize': 10}
+    )))
+    events = page.get('Events', [])
+
+    if events:
+        yield _ROOT_USAGE.instantiate(
+            f'Root account has been used {len(events)} times recently', 'Root Account')
 
 
 def check_root_usage():
-    cloudtrail = boto3.client('cloudtrail')
-    findings = []
-    detailed_findings = []
+    return _collect(_iter_root_usage(), "Error checking root usage")
 
-    try:
-        events = cloudtrail.lookup_events(
-            LookupAttributes=[{'AttributeKey': 'Username', 'AttributeValue': 'root'}],
-            MaxItems=10
-        )
-
-        if events['Events']:
-            finding = f"Root account usage detected ({len(events['Events'])} recent events)"
-            findings.append(finding)
-            detailed_findings.append({
-                'service': 'IAM',
-                'issue_type': 'Root Account Usage',
-                'description': f'Root account has been used {len(events["Events"])} times recently',
-                'severity': 'Critical',
-                'resource': 'Root Account',
-                'recommendation': 'Use IAM users with appropriate permissions instead of root account'
-            })
-    except Exception as e:
-        findings.append(f"Error checking root usage: {str(e)}")
 
-    return findings, detailed_findings
+def _iter_users_without_mfa():
+    for row in _get_credential_report():
+        if row['user'] == '<root_account>':
+            continue  # Root MFA is surfaced by the root-usage check's remit, not here
+        if row['mfa_active'] == 'false':
+            yield _NO_MFA.instantiate(
+                f'User "{row["user"]}" does not have MFA configured', row['user'])
 
 
 def check_users_without_mfa():
-    iam = boto3.client('iam')
-    findings = []
-    detailed_findings = []
+    return _collect(_iter_users_without_mfa(), "Error checking MFA status")
 
-    try:
-        users = iam.list_users()['Users']
-        users_without_mfa = []
-
-        for user in users:
-            mfa = iam.list_mfa_devices(UserName=user['UserName'])['MFADevices']
-            if not mfa:
-                users_without_mfa.append(user['UserName'])
-                finding = f"IAM User {user['UserName']} has no MFA enabled"
-                findings.append(finding)
-                detailed_findings.append({
-                    'service': 'IAM',
-                    'issue_type': 'No MFA',
-                    'description': f'User "{user["UserName"]}" does not have MFA configured',
-                    'severity': 'High',
-                    'resource': user['UserName'],
-                    'recommendation': 'Enable MFA for all IAM users with console access'
-                })
-    except Exception as e:
-        findings.append(f"Error checking MFA status: {str(e)}")
 
-    return findings, detailed_findings
+def _iter_unused_access_keys():
+    for row in _get_credential_report():
+        if row['user'] == '<root_account>':
+            continue
+        # The report carries both key slots inline; N/A means never used
+        for slot in ('1', '2'):
+            if (row[f'access_key_{slot}_active'] == 'true'
+                    and row[f'access_key_{slot}_last_used_date'] == 'N/A'):
+                yield _UNUSED_KEY.instantiate(
+                    f'Access key for user "{row["user"]}" has never been used',
+                    f"{row['user']} (key {slot})")
 
 
 def check_unused_access_keys():
-    iam = boto3.client('iam')
-    findings = []
-    detailed_findings = []
+    return _collect(_iter_unused_access_keys(), "Error checking access keys")
 
-    try:
-        users = iam.list_users()['Users']
-
-        for user in users:
-            access_keys = iam.list_access_keys(UserName=user['UserName'])['AccessKeyMetadata']
-            for key in access_keys:
-                try:
-                    last_used = iam.get_access_key_last_used(AccessKeyId=key['AccessKeyId'])
-                    if 'LastUsedDate' not in last_used['AccessKeyLastUsed']:
-                        finding = f"Unused access key for user {user['UserName']}"
-                        findings.append(finding)
-                        detailed_findings.append({
-                            'service': 'IAM',
-                            'issue_type': 'Unused Access Key',
-                            'description': f'Access key for user "{user["UserName"]}" has never been used',
-                            'severity': 'Medium',
-                            'resource': f"{user['UserName']} ({key['AccessKeyId'][:8]}...)",
-                            'recommendation': 'Remove unused access keys to reduce attack surface'
-                        })
-                except Exception:
-                    pass  # Skip if unable to get last used date
-    except Exception as e:
-        findings.append(f"Error checking access keys: {str(e)}")
-
-    return findings, detailed_findings
 
+def _iter_public_rds_instances():
+    rds = _client('rds')
 
-def check_public_rds_instances():
-    rds = boto3.client('rds')
-    findings = []
-    detailed_findings = []
+    # No server-side filter exists for PubliclyAccessible yet, so request
+    # full 100-record pages and discard non-public instances before any
+    # finding construction happens
+    pages = paginate(rds, 'describe_db_instances', 'DBInstances',
+                     PaginationConfig={'PageSize': 100})
+    for instance in (i for i in pages if i.get('PubliclyAccessible', False)):
+        yield _RDS_PUBLIC.instantiate(
+            f'RDS instance "{instance["DBInstanceIdentifier"]}" is publicly accessible',
+            instance['DBInstanceIdentifier'])
 
-    try:
-        instances = rds.describe_db_instances()['DBInstances']
-        for instance in instances:
-            if instance.get('PubliclyAccessible', False):
-                finding = f"Public RDS instance: {instance['DBInstanceIdentifier']}"
-                findings.append(finding)
-                detailed_findings.append({
-                    'service': 'RDS',
-                    'issue_type': 'Public Database',
-                    'description': f'RDS instance "{instance["DBInstanceIdentifier"]}" is publicly accessible',
-                    'severity': 'Critical',
-                    'resource': instance['DBInstanceIdentifier'],
-                    'recommendation': 'Disable public accessibility and use VPC security groups'
-                })
-    except Exception as e:
-        findings.append(f"Error checking RDS instances: {str(e)}")
 
-    return findings, detailed_findings
+def check_public_rds_instances():
+    return _collect(_iter_public_rds_instances(), "Error checking RDS instances")
 
 
 def run_all_checks():
     """Legacy function for backward compatibility"""
+    # This path has no scan cache of its own, so drop the shared credential
+    # report here; a warm process (e.g. a reused Lambda container) would
+    # otherwise keep serving the first invocation's MFA findings
+    _fetch_credential_report.cache_clear()
+
     findings = []
 
     s3_findings, _ = check_s3_public_buckets()
@@ -232,10 +441,17 @@ def run_all_checks():
     return findings
 
 
-def get_detailed_findings():
-    """Get detailed findings with severity levels and recommendations"""
+_scan_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _run_scan():
+    """Run every security check once and cache the combined findings"""
     all_detailed_findings = []
 
+    # Each scan should see fresh data
+    _fetch_credential_report.cache_clear()
+
     # Run all security checks
     checks = [
         check_s3_public_buckets,
@@ -246,35 +462,60 @@ def get_detailed_findings():
         check_public_rds_instances
     ]
 
-    for check_function in checks:
-        try:
-            _, detailed_findings = check_function()
-            all_detailed_findings.extend(detailed_findings)
-        except Exception as e:
-            # Add error as a finding
-            all_detailed_findings.append({
-                'service': 'System',
-                'issue_type': 'Check Error',
-                'description': f'Error running {check_function.__name__}: {str(e)}',
-                'severity': 'Medium',
-                'resource': 'Security Scanner',
-                'recommendation': 'Check AWS credentials and permissions'
-            })
+    # The checks are independent and network-bound, so fan them out and
+    # pay only the latency of the slowest service instead of the sum
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = {executor.submit(check_function): check_function for check_function in checks}
+        for future in as_completed(futures):
+            check_function = futures[future]
+            try:
+                _, detailed_findings = future.result()
+                all_detailed_findings.extend(detailed_findings)
+            except (botocore.exceptions.ClientError, botocore.exceptions.BotoCoreError) as e:
+                # AWS-side failures become findings; bugs in a check propagate
+                all_detailed_findings.append(_CHECK_ERROR.instantiate(
+                    f'Error running {check_function.__name__}: {str(e)}', 'Security Scanner'))
 
     return all_detailed_findings
 
 
-def get_summary_stats():
-    """Get summary statistics for the dashboard"""
-    detailed_findings = get_detailed_findings()
+def invalidate_scan():
+    """Drop the cached scan so the next findings/stats call re-scans"""
+    with _scan_lock:
+        _run_scan.cache_clear()
+
+
+def get_detailed_findings():
+    """Get detailed findings with severity levels and recommendations.
+
+    The scan itself runs at most once; callers wanting both findings and
+    summary stats share one cached result instead of scanning twice. Use
+    invalidate_scan() to force a fresh scan.
+    """
+    with _scan_lock:
+        return list(_run_scan())
+
+
+def summarize_findings(detailed_findings):
+    """Compute summary statistics from an existing list of findings"""
+    severity_counts = Counter()
+    services = set()
+    for finding in detailed_findings:
+        severity_counts[finding['severity']] += 1
+        services.add(finding['service'])
 
     stats = {
         'total_issues': len(detailed_findings),
-        'critical_issues': len([f for f in detailed_findings if f['severity'] == 'Critical']),
-        'high_issues': len([f for f in detailed_findings if f['severity'] == 'High']),
-        'medium_issues': len([f for f in detailed_findings if f['severity'] == 'Medium']),
-        'services_affected': len(set([f['service'] for f in detailed_findings])),
+        'critical_issues': severity_counts['Critical'],
+        'high_issues': severity_counts['High'],
+        'medium_issues': severity_counts['Medium'],
+        'services_affected': len(services),
         'scan_timestamp': datetime.now().isoformat()
     }
 
     return stats
+
+
+def get_summary_stats():
+    """Get summary statistics for the dashboard"""
+    return summarize_findings(get_detailed_findings())